@@ -1,7 +1,10 @@
-from .evaluator import DesignPrinciple, EvaluationResult, GPTGraphicDesignEvaluator
+from .evaluator import EvaluationResult, GPTGraphicDesignEvaluator
+from .prompts import DesignPrinciple
+from .utils import ImageFormat
 
 __all__ = [
     "DesignPrinciple",
     "EvaluationResult",
     "GPTGraphicDesignEvaluator",
+    "ImageFormat",
 ]
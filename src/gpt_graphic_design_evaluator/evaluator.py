@@ -1,74 +1,83 @@
-import base64
-import io
-from dataclasses import dataclass
-from typing import Dict, Final, List, Literal, Optional, cast
+import asyncio
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Hashable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import PydanticOutputParser, PydanticToolsParser
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import (
+    Runnable,
+    RunnableBinding,
+    RunnableConfig,
+    RunnableSequence,
+)
 from PIL import Image
-from pydantic import BaseModel, Field
-
-DesignPrinciple = Literal["alignment", "overlap", "whitespace"]
-
-DEFAULT_SYSTEM_PROMPT: Final[str] = """\
-You are an autonomous AI Assistant who aids designers by providing insightful, objective, and constructive critiques of graphic design projects. Your goals are: "Deliver comprehensive and unbiased evaluations of graphic designs based on the following design principles."
-
-Grade seriously. The range of scores is from 1 to 10. A flawless design can earn 10 points, a mediocre design can only earn 7 points, a design with obvious shortcomings can only earn 4 points, and a very poor design can only earn 1-2 points.
-
-{design_principle}
-
-If the output is too long, it will be truncated. Only respond in JSON format, no other information. Example of output for a better graphic design:
-
-{{
-    "score": 6, 
-    "explanation": "Please concisely explain the reason of the score."
-}}"""
-
-
-DEFAULT_ALIGNMENT_DESIGN_PRINCIPLE: Final[str] = """\
-Correct alignment is an important aspect of design that has been modeled in other layout applications. Text and graphic elements are aligned on the page to indicate organizational structure and aesthetics.
-
-Please evaluate the alignment of the input graphic design considering the following points.
-
-1. Alignment along with the horizontal and vertical direction is considered.
-2. The elements that align at a glance but slight misalignment are penalized because it is visually displeasing.
-3. Larger alignment groups (i.e., aligned elements that are distant from each other) are preferred as they produce simpler designs with more unity between elements."""
-
-DEFAULT_OVERLAP_DESIGN_PRINCIPLE: Final[str] = """\
-Overlapping elements are common in many designs and absent from others.
-Less or proper overlapping might be considered aesthetically pleasing, but others are not.
-
-Please consider the following points to evaluate the overlap.
-
-1. The three types of overlap, the overlap of elements on text, the overlap of text on graphics, and the overlap of graphics on other graphics, are considered.
-2. Hard-to-read text because of insufficient color contrast between a text and the background color is penalized.
-3. The graphic design that includes elements extending past the boundaries is also penalized."""
-
-DEFAULT_WHITE_SPACE_DESIGN_PRINCIPLE: Final[str] = """\
-White space in graphic designs is fundamental for readability and aesthetics. Element distance is also closely related to the principle of proximity, as elements placed near each other may appear to be related. White space also influences the overall design style; many modern designs use significant white space. White space 'trapped' between elements can also be distracting. 
-
-Evaluate the white space considering the following points.
-
-1.A large ratio of white space that is not covered by design elements (e.g., graphics and tests) is preferred.
-2. However, the graphic design with a too large region of empty white space on the image is undesirable.
-3. The greater the distance between each element is preferred.
-4. Uniformed vertical spacing of each text element is preferred.
-5. Wider border margins for each element are preferred."""
-
-
-DESIGN_PRINCIPLES: Dict[DesignPrinciple, str] = {
-    "alignment": DEFAULT_ALIGNMENT_DESIGN_PRINCIPLE,
-    "overlap": DEFAULT_OVERLAP_DESIGN_PRINCIPLE,
-    "whitespace": DEFAULT_WHITE_SPACE_DESIGN_PRINCIPLE,
-}
-
-USER_PROMPT: Final[str] = """\
-Please score the following images."""
+from pydantic import BaseModel, ConfigDict, Field
+
+# The prompts used to be defined in this module; the unused names are re-exported
+# so that importing them from here keeps working.
+from .prompts import (  # noqa: F401
+    DEFAULT_ALIGNMENT_DESIGN_PRINCIPLE,
+    DEFAULT_OVERLAP_DESIGN_PRINCIPLE,
+    DEFAULT_SYSTEM_MESSAGES,
+    DEFAULT_SYSTEM_PROMPT,
+    DEFAULT_SYSTEM_PROMPT_PREAMBLE,
+    DEFAULT_WHITE_SPACE_DESIGN_PRINCIPLE,
+    DESIGN_PRINCIPLE_MESSAGES,
+    DESIGN_PRINCIPLES,
+    USER_PROMPT,
+    DesignPrinciple,
+)
+from .utils import (
+    MAX_IMAGE_EDGE,
+    ImageFormat,
+    LRUCache,
+    image_fingerprint,
+    image_to_base64,
+)
+
+DEFAULT_MAX_CONCURRENCY: Final[int] = 8
+
+RESULT_CACHE_SIZE: Final[int] = 128
+
+# HTTP status codes with which providers that expose `n` but only accept `n=1`, e.g.
+# Groq, reject larger values.
+REJECTED_N_STATUS_CODES: Final[Tuple[int, ...]] = (400, 422)
+
+# Chat model fields naming the endpoint that requests are sent to. They are not part
+# of `_identifying_params`, e.g. for `ChatOpenAI` and `ChatAnthropic`.
+ENDPOINT_FIELDS: Final[Tuple[str, ...]] = (
+    "openai_api_base",
+    "azure_endpoint",
+    "anthropic_api_url",
+    "base_url",
+)
+
+ChainKey = Tuple[Optional[str], Optional[DesignPrinciple]]
+
+NativeNSampler = Tuple[BaseChatModel, Mapping[str, Any], Runnable]
 
 
 class EvaluationResult(BaseModel):
     """Evaluation result model for graphic design evaluation."""
 
+    # Results are shared through the result cache, so make them immutable.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     score: int = Field(
         ge=1,
         le=10,
@@ -81,21 +90,291 @@ class EvaluationResult(BaseModel):
 
 @dataclass
 class GPTGraphicDesignEvaluator(object):
+    """GPT-powered graphic design evaluator.
+
+    Attributes:
+        llm (BaseChatModel): The chat model with vision capabilities.
+        image_format (ImageFormat): The format used to encode images. Defaults to "jpeg".
+        max_image_edge (Optional[int]): The maximum length of the longer image edge;
+            larger images are downscaled before encoding. If None, images are sent at
+            their original size. Defaults to 1536.
+        prompt_cache_control (Optional[Dict[str, Any]]): The provider-specific cache
+            control, e.g. `{"type": "ephemeral"}` for Anthropic models. If given, the
+            default system prompt is split into a static preamble, which carries the
+            cache control, followed by the design principle. Defaults to None.
+        cache (Optional[MutableMapping[Hashable, List[EvaluationResult]]]): The cache of
+            evaluation results keyed by the model, its parameters and endpoint, the image
+            encoding settings, the image fingerprint, design principle and `num_return`,
+            so one cache can be shared between differently configured evaluators.
+            Repeated calls return the stored samples instead of sampling the model
+            again. Any mapping, e.g. one backed by Redis, can be plugged in; set to None
+            to disable caching and sample anew on every call. Defaults to an in-memory
+            LRU of 128 entries.
+        use_native_n (bool): Whether to request `num_return` completions in a single
+            call via the model's `n` parameter when the model supports it, instead of
+            sending `num_return` identical requests. If the server rejects `n`, or
+            ignores it, the missing samples are requested separately. Defaults to True.
+    """
+
     llm: BaseChatModel
+    image_format: ImageFormat = "jpeg"
+    max_image_edge: Optional[int] = MAX_IMAGE_EDGE
+    prompt_cache_control: Optional[Dict[str, Any]] = None
+    cache: Optional[MutableMapping[Hashable, List[EvaluationResult]]] = field(
+        default_factory=lambda: LRUCache(maxsize=RESULT_CACHE_SIZE), repr=False
+    )
 
-    def _image_to_base64(self, image: Image.Image) -> str:
-        """Convert a PIL Image to a base64-encoded PNG string.
+    use_native_n: bool = True
+
+    _structured_llm: Runnable = field(init=False, repr=False)
+    _native_n: Optional[NativeNSampler] = field(init=False, repr=False)
+    _chains: Dict[ChainKey, RunnableSequence] = field(init=False, repr=False)
+    _cache_namespace: Hashable = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._structured_llm = self.llm.with_structured_output(EvaluationResult)
+        self._native_n = self._get_native_n_sampler()
+        self._chains = {}
+        # Results depend on the model and on how images are sent to it, so keep
+        # them apart when a cache is shared between evaluators.
+        endpoint = {
+            name: getattr(self.llm, name)
+            for name in ENDPOINT_FIELDS
+            if getattr(self.llm, name, None) is not None
+        }
+        self._cache_namespace = (
+            self.llm._llm_type,
+            repr(sorted(self.llm._identifying_params.items())),
+            repr(sorted(endpoint.items())),
+            self.image_format,
+            self.max_image_edge,
+            self.use_native_n,
+        )
 
-        Args:
-            image (Image.Image): The input PIL Image.
+    def _get_native_n_sampler(self) -> Optional[NativeNSampler]:
+        # Chat models exposing an `n` field (e.g. `ChatOpenAI`) can return several
+        # completions for a single prompt. `invoke` only ever returns the first one,
+        # so split the structured-output runnable into the bound chat model, whose
+        # `generate` exposes all completions, and the parser applied to each of them.
+        if not self.use_native_n or "n" not in type(self.llm).model_fields:
+            return None
+        structured_llm = self._structured_llm
+        if not (
+            isinstance(structured_llm, RunnableSequence)
+            and isinstance(structured_llm.first, RunnableBinding)
+            and isinstance(structured_llm.first.bound, BaseChatModel)
+        ):
+            return None
+
+        llm_kwargs = structured_llm.first.kwargs
+        parser: Runnable = structured_llm.last
+        if not isinstance(parser, (PydanticOutputParser, PydanticToolsParser)):
+            # Other parsers may only read what the model attached to the first
+            # completion, e.g. the `parsed` output of OpenAI's `json_schema` method.
+            # A JSON response format still puts each completion's JSON in its own
+            # content, so parse that instead; otherwise, do not use `n` at all.
+            if "response_format" not in llm_kwargs:
+                return None
+            parser = PydanticOutputParser(pydantic_object=EvaluationResult)
+        return structured_llm.first.bound, llm_kwargs, parser
+
+    def _preamble_message(self) -> SystemMessage:
+        return SystemMessage(
+            content=[
+                {
+                    "type": "text",
+                    "text": DEFAULT_SYSTEM_PROMPT_PREAMBLE,
+                    "cache_control": self.prompt_cache_control,
+                }
+            ]
+        )
 
-        Returns:
-            str: The base64-encoded PNG string.
-        """
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-        return img_str
+    def _get_chain(
+        self,
+        system_prompt_template: Optional[str] = None,
+        design_principle: Optional[DesignPrinciple] = None,
+    ) -> RunnableSequence:
+        # The chain only depends on the system prompt template (or, for the default
+        # template, the pre-rendered design principle), so build it once per key.
+        key = (system_prompt_template, design_principle)
+        chain = self._chains.get(key)
+        if chain is not None:
+            return chain
+
+        system_prompts: List[Union[SystemMessage, SystemMessagePromptTemplate]]
+        if system_prompt_template is not None:
+            system_prompts = [
+                SystemMessagePromptTemplate.from_template(
+                    template=system_prompt_template,
+                )
+            ]
+        elif self.prompt_cache_control is None:
+            system_prompts = [
+                DEFAULT_SYSTEM_MESSAGES[design_principle]
+                if design_principle is not None
+                else SystemMessagePromptTemplate.from_template(
+                    template=DEFAULT_SYSTEM_PROMPT,
+                )
+            ]
+        # With a cache control, send the static preamble first as its own message and
+        # the design principle after it.
+        elif design_principle is not None:
+            system_prompts = [
+                self._preamble_message(),
+                DESIGN_PRINCIPLE_MESSAGES[design_principle],
+            ]
+        else:
+            system_prompts = [
+                self._preamble_message(),
+                SystemMessagePromptTemplate.from_template(
+                    template="{design_principle}"
+                ),
+            ]
+        user_prompt = (
+            "user",
+            [
+                {"type": "text", "text": USER_PROMPT},
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": "data:image/{image_format};base64,{base64_image}"
+                    },
+                },
+            ],
+        )
+        prompt = ChatPromptTemplate.from_messages([*system_prompts, user_prompt])
+
+        chain = RunnableSequence(prompt, self._structured_llm)
+        self._chains[key] = chain
+        return chain
+
+    def _image_input(
+        self,
+        image: Image.Image,
+        base64_image: Optional[str] = None,
+        fingerprint: Optional[bytes] = None,
+    ) -> Dict[str, str]:
+        if base64_image is None:
+            base64_image = image_to_base64(
+                image,
+                image_format=self.image_format,
+                max_edge=self.max_image_edge,
+                fingerprint=fingerprint,
+            )
+        return {"image_format": self.image_format, "base64_image": base64_image}
+
+    def _prepare_batch(
+        self,
+        input_data: Dict[str, str],
+        num_return: int,
+        max_concurrency: Optional[int],
+    ) -> Tuple[List[Dict[str, str]], RunnableConfig]:
+        # Give every request its own input dict; `[input_data] * num_return` would
+        # alias a single dict across all of them.
+        inputs = [dict(input_data) for _ in range(num_return)]
+
+        # The `num_return` requests are independent network round-trips, so
+        # run them concurrently with a bounded number of in-flight requests.
+        config: RunnableConfig = {
+            "max_concurrency": max_concurrency
+            or min(num_return, DEFAULT_MAX_CONCURRENCY)
+        }
+        return inputs, config
+
+    def _parse_samples(
+        self, parser: Runnable, result: LLMResult, num_return: int
+    ) -> List[EvaluationResult]:
+        generations = result.generations[0][:num_return]
+        if len(generations) < num_return:
+            # The server ignored `n`, as some OpenAI-compatible servers do, so stop
+            # using it; the caller requests the missing samples separately.
+            self._native_n = None
+        return [
+            parser.invoke(cast(ChatGeneration, generation).message)
+            for generation in generations
+        ]
+
+    def _reject_native_n(self, error: Exception) -> None:
+        # Only a request rejected for its parameters means that `n` is unsupported;
+        # anything else, e.g. an authentication error, is not retried.
+        if getattr(error, "status_code", None) not in REJECTED_N_STATUS_CODES:
+            raise error
+        self._native_n = None
+
+    def _get_cached(self, cache_key: Hashable) -> Optional[List[EvaluationResult]]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(cache_key)
+        return None if cached is None else list(cached)
+
+    def _set_cached(self, cache_key: Hashable, results: List[EvaluationResult]) -> None:
+        if self.cache is not None:
+            self.cache[cache_key] = list(results)
+
+    def _run(
+        self,
+        chain: RunnableSequence,
+        input_data: Dict[str, str],
+        num_return: int,
+        max_concurrency: Optional[int],
+    ) -> List[EvaluationResult]:
+        if num_return < 1:
+            return []
+        if num_return == 1:
+            # Skip the thread pool `batch` would spin up for a single request.
+            return [cast(EvaluationResult, chain.invoke(input_data))]
+
+        samples: List[EvaluationResult] = []
+        if self._native_n is not None:
+            llm, llm_kwargs, parser = self._native_n
+            messages = chain.first.invoke(input_data).to_messages()
+            try:
+                result = llm.generate([messages], n=num_return, **llm_kwargs)
+            except Exception as error:
+                self._reject_native_n(error)
+            else:
+                samples = self._parse_samples(parser, result, num_return)
+                if len(samples) == num_return:
+                    return samples
+
+        inputs, config = self._prepare_batch(
+            input_data, num_return - len(samples), max_concurrency
+        )
+        return samples + cast(
+            List[EvaluationResult], chain.batch(inputs, config=config)
+        )
+
+    async def _arun(
+        self,
+        chain: RunnableSequence,
+        input_data: Dict[str, str],
+        num_return: int,
+        max_concurrency: Optional[int],
+    ) -> List[EvaluationResult]:
+        if num_return < 1:
+            return []
+        if num_return == 1:
+            return [cast(EvaluationResult, await chain.ainvoke(input_data))]
+
+        samples: List[EvaluationResult] = []
+        if self._native_n is not None:
+            llm, llm_kwargs, parser = self._native_n
+            messages = (await chain.first.ainvoke(input_data)).to_messages()
+            try:
+                result = await llm.agenerate([messages], n=num_return, **llm_kwargs)
+            except Exception as error:
+                self._reject_native_n(error)
+            else:
+                samples = self._parse_samples(parser, result, num_return)
+                if len(samples) == num_return:
+                    return samples
+
+        inputs, config = self._prepare_batch(
+            input_data, num_return - len(samples), max_concurrency
+        )
+        return samples + cast(
+            List[EvaluationResult], await chain.abatch(inputs, config=config)
+        )
 
     def evaluate(
         self,
@@ -103,6 +382,8 @@ class GPTGraphicDesignEvaluator(object):
         design_principle_prompt: str,
         system_prompt_template: Optional[str] = None,
         num_return: int = 1,
+        base64_image: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
     ) -> List[EvaluationResult]:
         """Evaluate the graphic design image based on the given design principle.
 
@@ -110,41 +391,66 @@ class GPTGraphicDesignEvaluator(object):
             image (Image.Image): The input graphic design image as a PIL Image.
             design_principle_prompt (str): The design principle prompt to guide the evaluation.
             system_prompt_template (Optional[str], optional): The system prompt template.
-                If None, the default SYSTEM_PROMPT is used. Defaults to None.
+                If None, the default system prompt is used. Defaults to None.
             num_return (int, optional): The number of evaluation results to return. Defaults to 1.
+            base64_image (Optional[str], optional): The pre-encoded base64 image. If given,
+                `image` is not encoded again. Defaults to None.
+            max_concurrency (Optional[int], optional): The maximum number of concurrent
+                LLM requests. If None, `min(num_return, 8)` is used. Defaults to None.
 
         Returns:
             EvaluationResult: The evaluation result containing the score and explanation.
         """
-        system_prompt_template = system_prompt_template or DEFAULT_SYSTEM_PROMPT
+        chain = self._get_chain(system_prompt_template=system_prompt_template)
+        input_data = {
+            "design_principle": design_principle_prompt,
+            **self._image_input(image, base64_image=base64_image),
+        }
+        return self._run(chain, input_data, num_return, max_concurrency)
 
-        system_prompt = SystemMessagePromptTemplate.from_template(
-            template=system_prompt_template,
-        )
-        user_prompt = (
-            "user",
-            [
-                {"type": "text", "text": USER_PROMPT},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": "data:image/png;base64,{base64_image}"},
-                },
-            ],
-        )
-        prompt = ChatPromptTemplate.from_messages([system_prompt, user_prompt])
+    async def aevaluate(
+        self,
+        image: Image.Image,
+        design_principle_prompt: str,
+        system_prompt_template: Optional[str] = None,
+        num_return: int = 1,
+        base64_image: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[EvaluationResult]:
+        """Asynchronously evaluate the graphic design image based on the given design principle.
 
-        chain = prompt | self.llm.with_structured_output(EvaluationResult)
+        Args:
+            image (Image.Image): The input graphic design image as a PIL Image.
+            design_principle_prompt (str): The design principle prompt to guide the evaluation.
+            system_prompt_template (Optional[str], optional): The system prompt template.
+                If None, the default system prompt is used. Defaults to None.
+            num_return (int, optional): The number of evaluation results to return. Defaults to 1.
+            base64_image (Optional[str], optional): The pre-encoded base64 image. If given,
+                `image` is not encoded again. Defaults to None.
+            max_concurrency (Optional[int], optional): The maximum number of concurrent
+                LLM requests. If None, `min(num_return, 8)` is used. Defaults to None.
 
+        Returns:
+            EvaluationResult: The evaluation result containing the score and explanation.
+        """
+        # Load and encode the image off the event loop while the chain is looked up
+        # or built.
+        image_input = asyncio.get_running_loop().run_in_executor(
+            None, self._image_input, image, base64_image
+        )
+        chain = self._get_chain(system_prompt_template=system_prompt_template)
         input_data = {
             "design_principle": design_principle_prompt,
-            "base64_image": self._image_to_base64(image),
+            **(await image_input),
         }
-        inputs = [input_data] * num_return
-
-        return cast(List[EvaluationResult], chain.batch(inputs))
+        return await self._arun(chain, input_data, num_return, max_concurrency)
 
     def __call__(
-        self, image: Image.Image, design_principle: DesignPrinciple, num_return: int = 1
+        self,
+        image: Image.Image,
+        design_principle: DesignPrinciple,
+        num_return: int = 1,
+        max_concurrency: Optional[int] = None,
     ) -> List[EvaluationResult]:
         """Evaluate the graphic design image based on the specified design principle.
 
@@ -152,13 +458,79 @@ class GPTGraphicDesignEvaluator(object):
             image (Image.Image): The input graphic design image as a PIL Image.
             design_principle (DesignPrinciple): The design principle to evaluate.
             num_return (int, optional): The number of evaluation results to return. Defaults to 1.
+            max_concurrency (Optional[int], optional): The maximum number of concurrent
+                LLM requests. If None, `min(num_return, 8)` is used. Defaults to None.
+
+        Returns:
+            EvaluationResult: The evaluation result containing the score and explanation.
+        """
+        # The fingerprint keys both the result cache and the base64 memo, so hash
+        # the image only once.
+        fingerprint = image_fingerprint(image)
+        cache_key: Hashable = None
+        if self.cache is not None:
+            cache_key = (
+                self._cache_namespace,
+                fingerprint,
+                design_principle,
+                num_return,
+            )
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+
+        chain = self._get_chain(design_principle=design_principle)
+        image_input = self._image_input(image, fingerprint=fingerprint)
+        results = self._run(chain, image_input, num_return, max_concurrency)
+        self._set_cached(cache_key, results)
+        return results
+
+    async def acall(
+        self,
+        image: Image.Image,
+        design_principle: DesignPrinciple,
+        num_return: int = 1,
+        max_concurrency: Optional[int] = None,
+    ) -> List[EvaluationResult]:
+        """Asynchronously evaluate the graphic design image based on the specified design principle.
+
+        This is the async counterpart of `__call__`, so that several images and
+        design principles can be evaluated concurrently under a single event loop,
+        e.g. with `asyncio.gather`. Image loading, hashing and encoding run in the
+        default executor so that they do not block the event loop.
+
+        Args:
+            image (Image.Image): The input graphic design image as a PIL Image.
+            design_principle (DesignPrinciple): The design principle to evaluate.
+            num_return (int, optional): The number of evaluation results to return. Defaults to 1.
+            max_concurrency (Optional[int], optional): The maximum number of concurrent
+                LLM requests. If None, `min(num_return, 8)` is used. Defaults to None.
 
         Returns:
             EvaluationResult: The evaluation result containing the score and explanation.
         """
-        return self.evaluate(
-            image=image,
-            system_prompt_template=DEFAULT_SYSTEM_PROMPT,
-            design_principle_prompt=DESIGN_PRINCIPLES[design_principle],
-            num_return=num_return,
+        loop = asyncio.get_running_loop()
+        # Lazily opened images are loaded along with hashing them.
+        fingerprint = await loop.run_in_executor(None, image_fingerprint, image)
+        cache_key: Hashable = None
+        if self.cache is not None:
+            cache_key = (
+                self._cache_namespace,
+                fingerprint,
+                design_principle,
+                num_return,
+            )
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+
+        # Encode the image off the event loop while the chain is looked up or built.
+        image_input = loop.run_in_executor(
+            None, self._image_input, image, None, fingerprint
+        )
+        chain = self._get_chain(design_principle=design_principle)
+        results = await self._arun(
+            chain, await image_input, num_return, max_concurrency
         )
+        self._set_cached(cache_key, results)
+        return results
@@ -0,0 +1,201 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import (
+    Final,
+    Hashable,
+    Iterator,
+    Literal,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from PIL import Image, ImageOps
+
+try:
+    # Encodes straight into a `str`, skipping the intermediate base64 `bytes`.
+    from pybase64 import b64encode_as_string
+except ImportError:
+    from base64 import b64encode
+
+    def b64encode_as_string(s: memoryview) -> str:  # type: ignore[misc]
+        return b64encode(s).decode("ascii")
+
+
+ImageFormat = Literal["jpeg", "png"]
+
+JPEG_QUALITY: Final[int] = 85
+
+PNG_COMPRESS_LEVEL: Final[int] = 1
+
+MAX_IMAGE_EDGE: Final[int] = 1536
+
+BASE64_CACHE_SIZE: Final[int] = 8
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(MutableMapping[K, V]):
+    """A thread-safe mapping that evicts the least recently used entries.
+
+    Args:
+        maxsize (int): The maximum number of entries to keep.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: K) -> V:
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self) -> Iterator[K]:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Serializes the decoding of lazily opened images across threads.
+_load_lock = threading.Lock()
+
+_base64_cache: LRUCache[Tuple[bytes, ImageFormat, int, Optional[int]], str] = LRUCache(
+    maxsize=BASE64_CACHE_SIZE
+)
+
+
+def load_image(image: Image.Image) -> None:
+    """Decode a lazily opened PIL Image.
+
+    Pillow decodes images opened from files on first access, which is not safe
+    to trigger from several threads at once, e.g. when the same image is
+    evaluated against several design principles concurrently. This is a no-op
+    for images that are already loaded.
+
+    Args:
+        image (Image.Image): The input PIL Image.
+    """
+    with _load_lock:
+        image.load()
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    # JPEG has no alpha channel; flatten transparent regions onto white
+    # instead of letting them turn black.
+    if image.has_transparency_data:
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _encode_image(
+    image: Image.Image,
+    image_format: ImageFormat,
+    compress_level: int,
+    max_edge: Optional[int],
+) -> str:
+    if max_edge is not None and max(image.size) > max_edge:
+        # `contain` returns a new image, so the caller's image is left untouched.
+        image = ImageOps.contain(
+            image, (max_edge, max_edge), method=Image.Resampling.LANCZOS
+        )
+
+    buffered = io.BytesIO()
+    if image_format == "jpeg":
+        _to_rgb(image).save(buffered, format="JPEG", quality=JPEG_QUALITY)
+    else:
+        image.save(
+            buffered, format="PNG", compress_level=compress_level, optimize=False
+        )
+    # Release the buffer export right away so the encoded image can be freed as
+    # soon as `buffered` goes out of scope.
+    with buffered.getbuffer() as data:
+        return b64encode_as_string(data)
+
+
+def image_fingerprint(image: Image.Image) -> bytes:
+    """Compute a content hash of a PIL Image.
+
+    Unlike ``id(image)``, the fingerprint is stable across image objects with
+    the same mode, size and pixels, so it can be used as a result cache key.
+
+    Args:
+        image (Image.Image): The input PIL Image.
+
+    Returns:
+        bytes: The 16-byte BLAKE2b digest of the image.
+    """
+    load_image(image)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.width}x{image.height}".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.digest()
+
+
+def image_to_base64(
+    image: Image.Image,
+    image_format: ImageFormat = "jpeg",
+    compress_level: int = PNG_COMPRESS_LEVEL,
+    max_edge: Optional[int] = MAX_IMAGE_EDGE,
+    fingerprint: Optional[bytes] = None,
+) -> str:
+    """Convert a PIL Image to a base64-encoded JPEG or PNG string.
+
+    Images whose longer edge exceeds `max_edge` are downscaled first; vision
+    models resize large inputs internally anyway, so sending the full
+    resolution only costs encoding time and input tokens.
+
+    JPEG is the default as it is much cheaper to encode and yields a far
+    smaller payload for the LLM; use PNG when lossless input is required.
+    PNG is written with a low zlib level by default, trading a slightly
+    larger payload for much faster encoding.
+
+    The result is memoized for the last few images, so evaluating the same
+    image against several design principles encodes it only once. Entries are
+    keyed by the content fingerprint of the image, so an image modified in
+    place is encoded again instead of returning its stale encoding.
+
+    Args:
+        image (Image.Image): The input PIL Image.
+        image_format (ImageFormat, optional): The encoding format. Defaults to "jpeg".
+        compress_level (int, optional): The zlib compression level (0-9) used for PNG.
+            Defaults to 1.
+        max_edge (Optional[int], optional): The maximum length of the longer image edge.
+            If None, the image is encoded at its original size. Defaults to 1536.
+        fingerprint (Optional[bytes], optional): The precomputed `image_fingerprint`
+            of the image. If None, it is computed here. Defaults to None.
+
+    Returns:
+        str: The base64-encoded image string.
+    """
+    load_image(image)
+    if fingerprint is None:
+        fingerprint = image_fingerprint(image)
+    key = (fingerprint, image_format, compress_level, max_edge)
+    img_str = _base64_cache.get(key)
+    if img_str is None:
+        img_str = _encode_image(image, image_format, compress_level, max_edge)
+        _base64_cache[key] = img_str
+    return img_str
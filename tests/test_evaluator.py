@@ -0,0 +1,270 @@
+import asyncio
+import io
+import json
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+import pytest
+from langchain_openai import ChatOpenAI
+from PIL import Image, ImageFile
+from pydantic import SecretStr
+
+from gpt_graphic_design_evaluator import EvaluationResult, GPTGraphicDesignEvaluator
+from gpt_graphic_design_evaluator.prompts import (
+    DEFAULT_SYSTEM_PROMPT,
+    DESIGN_PRINCIPLES,
+)
+from gpt_graphic_design_evaluator.utils import LRUCache
+
+
+class FakeChatCompletions(object):
+    """A mock OpenAI chat completions endpoint returning one choice per `n`."""
+
+    def __init__(self, ignore_n: bool = False, reject_n: bool = False) -> None:
+        self.ignore_n = ignore_n
+        self.reject_n = reject_n
+        self.requests: List[dict] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        self.requests.append(payload)
+        if self.reject_n and payload.get("n", 1) > 1:
+            return httpx.Response(
+                400,
+                json={
+                    "error": {
+                        "message": "'n' : number must be at most 1",
+                        "type": "invalid_request_error",
+                    }
+                },
+            )
+        num_choices = 1 if self.ignore_n else payload.get("n", 1)
+        choices = [
+            {
+                "index": i,
+                "message": {
+                    "role": "assistant",
+                    "content": json.dumps(
+                        {"score": i + 1, "explanation": f"Explanation {i + 1}."}
+                    ),
+                    "refusal": None,
+                },
+                "finish_reason": "stop",
+                "logprobs": None,
+            }
+            for i in range(num_choices)
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": payload["model"],
+                "choices": choices,
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": num_choices,
+                    "total_tokens": 1 + num_choices,
+                },
+            },
+        )
+
+
+def make_evaluator(
+    server: FakeChatCompletions,
+    model: str = "gpt-4o",
+    base_url: Optional[str] = None,
+    **kwargs: Any,
+) -> GPTGraphicDesignEvaluator:
+    transport = httpx.MockTransport(server)
+    llm = ChatOpenAI(
+        model=model,
+        base_url=base_url,
+        api_key=SecretStr("test"),
+        max_retries=0,
+        http_client=httpx.Client(transport=transport),
+        http_async_client=httpx.AsyncClient(transport=transport),
+    )
+    kwargs.setdefault("cache", None)
+    return GPTGraphicDesignEvaluator(llm=llm, **kwargs)
+
+
+@pytest.fixture
+def image() -> Image.Image:
+    return Image.new("RGB", (64, 64), "white")
+
+
+def test_native_n_parses_every_choice(image: Image.Image) -> None:
+    server = FakeChatCompletions()
+    evaluator = make_evaluator(server)
+
+    results = evaluator(image, "alignment", num_return=3)
+
+    assert [result.score for result in results] == [1, 2, 3]
+    assert len(server.requests) == 1
+    assert server.requests[0]["n"] == 3
+
+
+def test_native_n_parses_every_choice_async(image: Image.Image) -> None:
+    server = FakeChatCompletions()
+    evaluator = make_evaluator(server)
+
+    results = asyncio.run(evaluator.acall(image, "alignment", num_return=3))
+
+    assert [result.score for result in results] == [1, 2, 3]
+    assert len(server.requests) == 1
+
+
+def test_native_n_falls_back_when_n_is_ignored(image: Image.Image) -> None:
+    server = FakeChatCompletions(ignore_n=True)
+    evaluator = make_evaluator(server)
+
+    results = evaluator(image, "alignment", num_return=3)
+
+    assert len(results) == 3
+    # The completion returned for the request with `n` is kept, and only the two
+    # missing ones are requested separately.
+    assert len(server.requests) == 3
+    assert all("n" not in payload for payload in server.requests[1:])
+
+    server.requests.clear()
+    evaluator(image, "overlap", num_return=3)
+    assert len(server.requests) == 3
+
+
+def test_native_n_falls_back_when_n_is_rejected(image: Image.Image) -> None:
+    server = FakeChatCompletions(reject_n=True)
+    evaluator = make_evaluator(server)
+
+    results = evaluator(image, "alignment", num_return=3)
+
+    assert len(results) == 3
+    # The rejected request with `n`, then one request per result.
+    assert len(server.requests) == 4
+    assert all("n" not in payload for payload in server.requests[1:])
+
+    server.requests.clear()
+    asyncio.run(evaluator.acall(image, "overlap", num_return=3))
+    assert len(server.requests) == 3
+
+
+def test_native_n_falls_back_when_n_is_rejected_async(image: Image.Image) -> None:
+    server = FakeChatCompletions(reject_n=True)
+    evaluator = make_evaluator(server)
+
+    results = asyncio.run(evaluator.acall(image, "alignment", num_return=3))
+
+    assert len(results) == 3
+    assert len(server.requests) == 4
+
+
+def test_zero_num_return_sends_no_request(image: Image.Image) -> None:
+    server = FakeChatCompletions()
+    evaluator = make_evaluator(server)
+
+    assert evaluator(image, "alignment", num_return=0) == []
+    assert asyncio.run(evaluator.acall(image, "alignment", num_return=0)) == []
+    assert server.requests == []
+
+
+def test_default_system_prompt_is_sent_as_a_single_message(image: Image.Image) -> None:
+    server = FakeChatCompletions()
+    evaluator = make_evaluator(server)
+
+    evaluator(image, "alignment")
+
+    system_messages = [
+        message
+        for message in server.requests[0]["messages"]
+        if message["role"] == "system"
+    ]
+    assert system_messages == [
+        {
+            "role": "system",
+            "content": DEFAULT_SYSTEM_PROMPT.format(
+                design_principle=DESIGN_PRINCIPLES["alignment"]
+            ),
+        }
+    ]
+
+
+def test_result_cache_returns_stored_samples(image: Image.Image) -> None:
+    server = FakeChatCompletions()
+    evaluator = make_evaluator(server, cache=LRUCache(maxsize=8))
+
+    results = evaluator(image, "alignment", num_return=2)
+    assert evaluator(image, "alignment", num_return=2) == results
+    assert len(server.requests) == 1
+
+    evaluator(image, "overlap", num_return=2)
+    evaluator(image, "alignment", num_return=3)
+    assert len(server.requests) == 3
+
+
+def test_result_cache_detects_in_place_modifications() -> None:
+    server = FakeChatCompletions()
+    evaluator = make_evaluator(server, cache=LRUCache(maxsize=8))
+    image = Image.new("RGB", (64, 64), "white")
+
+    evaluator(image, "alignment")
+    base64_image = server.requests[0]["messages"][-1]["content"][1]["image_url"]
+    image.putpixel((0, 0), (0, 0, 0))
+    evaluator(image, "alignment")
+
+    assert len(server.requests) == 2
+    assert server.requests[1]["messages"][-1]["content"][1]["image_url"] != (
+        base64_image
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"image_format": "png"},
+        {"max_image_edge": 32},
+        {"use_native_n": False},
+        {"model": "gpt-4o-mini"},
+        {"base_url": "http://localhost:8000/v1"},
+    ],
+)
+def test_result_cache_is_not_shared_across_configurations(
+    image: Image.Image, kwargs: Dict[str, Any]
+) -> None:
+    server = FakeChatCompletions()
+    cache: LRUCache[Hashable, List[EvaluationResult]] = LRUCache(maxsize=8)
+
+    make_evaluator(server, cache=cache)(image, "alignment")
+    make_evaluator(server, cache=cache, **kwargs)(image, "alignment")
+
+    assert len(server.requests) == 2
+
+
+def test_acall_loads_lazily_opened_images_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    server = FakeChatCompletions()
+    evaluator = make_evaluator(server)
+    buffered = io.BytesIO()
+    Image.new("RGB", (64, 64), "white").save(buffered, format="PNG")
+    image = Image.open(buffered)
+
+    load = ImageFile.ImageFile.load
+    load_threads = []
+
+    def record_load(self: ImageFile.ImageFile) -> Any:
+        load_threads.append(threading.get_ident())
+        return load(self)
+
+    monkeypatch.setattr(ImageFile.ImageFile, "load", record_load)
+
+    async def evaluate() -> Tuple[List[EvaluationResult], List[EvaluationResult]]:
+        return await asyncio.gather(
+            evaluator.acall(image, "alignment"),
+            evaluator.acall(image, "overlap"),
+        )
+
+    assert len(asyncio.run(evaluate())) == 2
+    assert load_threads
+    assert threading.get_ident() not in load_threads